@@ -0,0 +1,21 @@
+"""ASGI application file for the async serving mode, serving the async controllers
+with an asyncio database driver. Run with an ASGI server, e.g.
+    hypercorn "asgi:create_asgi_app()" --workers 2"""
+
+from quart import Quart
+from async_extensions import init_async_db
+
+
+def create_asgi_app(config_class="config.DevConfig"):
+    """Create and configure Quart application instance using DevConfig configuration"""
+
+    app = Quart(__name__)  # Quart mirrors the Flask API, but views can await I/O
+    app.config.from_object(config_class)  # Same config classes as the sync app
+    init_async_db(app)  # Asyncio engine using ASYNC_DATABASE_URI or the sync URI
+
+    from controllers.asgi import async_controller_blueprints
+
+    for controller in async_controller_blueprints:  # Register each async blueprint
+        app.register_blueprint(controller)
+
+    return app  # Return the configured app instance
@@ -0,0 +1,65 @@
+"""Setup asyncio database engine and sessions for the async (ASGI) serving mode"""
+
+from quart import current_app, g
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+# Asyncio driver used in place of each synchronous driver
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_uri(uri):
+    """Convert a synchronous database URI from config to its asyncio driver
+    equivalent, e.g. postgresql+psycopg2:// becomes postgresql+asyncpg://"""
+
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def init_async_db(app):
+    """Create the asyncio engine and session factory for app, using ASYNC_DATABASE_URI
+    or the asyncio equivalent of SQLALCHEMY_DATABASE_URI."""
+
+    uri = app.config.get("ASYNC_DATABASE_URI") or async_database_uri(
+        app.config["SQLALCHEMY_DATABASE_URI"]
+    )
+    options = {}
+    if make_url(uri).database in (None, "", ":memory:"):
+        # Every new in-memory SQLite connection is a new empty database, so share one
+        options = {"poolclass": StaticPool}
+    engine = create_async_engine(uri, **options)
+
+    if engine.dialect.name == "sqlite":
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def set_sqlite_pragma(dbapi_connection, connection_record):
+            """Enforce FK relationships on each aiosqlite connection, as the listener in
+            main.py only matches the synchronous sqlite3 connection object."""
+
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+    app.extensions["async_engine"] = engine
+    # expire_on_commit=False lets schemas dump instances after commit without
+    # triggering a lazy load, which is not allowed outside an await
+    app.extensions["async_session"] = async_sessionmaker(engine, expire_on_commit=False)
+
+    @app.teardown_appcontext
+    async def close_session(exc):
+        """Return the connection of the request's session, if one was opened."""
+
+        session = g.pop("async_session", None)
+        if session is not None:
+            await session.close()
+
+
+def get_session():
+    """Return the AsyncSession of the current request, opening it on first use."""
+
+    if "async_session" not in g:
+        g.async_session = current_app.extensions["async_session"]()
+    return g.async_session
@@ -9,6 +9,24 @@ class Config:
 
     SECRET_KEY = os.getenv("SECRET_KEY")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Asyncio driver URI for asgi.py, derived from SQLALCHEMY_DATABASE_URI if not set
+    ASYNC_DATABASE_URI = os.getenv("ASYNC_DATABASE_URI")
+
+    # Sampling profiler, see profiler.py. A low sample rate keeps overhead small enough
+    # to leave enabled in production
+    PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+    PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", "0.01"))
+    PROFILER_INTERVAL = float(os.getenv("PROFILER_INTERVAL", "0.005"))  # Seconds
+    PROFILER_FLUSH_INTERVAL = float(os.getenv("PROFILER_FLUSH_INTERVAL", "60"))
+    PROFILER_DIR = os.getenv("PROFILER_DIR", "profiles")
+    PROFILER_MAX_BYTES = 10 * 1024 * 1024  # Rotate collapsed stack files at 10 MB
+    PROFILER_BACKUP_COUNT = 5
+    # Limit on all files in PROFILER_DIR together, from every worker past and present.
+    # Oldest files are deleted after each flush, so the directory can only exceed it by
+    # what one flush writes. The files the flushing worker is writing to are kept
+    PROFILER_MAX_TOTAL_BYTES = int(
+        os.getenv("PROFILER_MAX_TOTAL_BYTES", str(200 * 1024 * 1024))
+    )
 
 
 class DevConfig(Config):
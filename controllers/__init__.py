@@ -2,5 +2,6 @@
 
 from .addresses_controllers import addresses
 from .customers_controllers import customers
+from .cli_controllers import db_commands
 
-controller_blueprints = [addresses, customers]
+controller_blueprints = [addresses, customers, db_commands]
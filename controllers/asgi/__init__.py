@@ -0,0 +1,6 @@
+"""Import all async controller blueprints as a list to be registered in asgi.py"""
+
+from .addresses_controllers import addresses
+from .customers_controllers import customers
+
+async_controller_blueprints = [addresses, customers]
@@ -0,0 +1,37 @@
+"""Async versions of the address routes for the ASGI serving mode."""
+
+from quart import Blueprint, request, jsonify, abort
+from sqlalchemy.exc import IntegrityError
+from marshmallow.exceptions import ValidationError
+from async_extensions import get_session
+from models import Address
+from schemas import address_schema, address_data_schema
+
+addresses = Blueprint("addresses", __name__, url_prefix="/addresses")
+
+
+@addresses.route("", methods=["POST"])
+async def create_address():
+    """Create a new address from a POST request."""
+
+    session = get_session()
+    try:
+        data = await request.get_json()  # Body is read without blocking the event loop
+        if not data:  # Validate that request contains data
+            abort(400, description="No input data provided.")
+
+        # Schema validates fields without a session, the model validators are CPU only
+        address = Address(**address_data_schema.load(data))
+        session.add(address)
+        await session.commit()
+        return jsonify(address_schema.dump(address)), 201
+
+    except ValidationError as e:  # Marshmallow validation of missing or invalid fields
+        return {"error": "Invalid format", "messages": str(e.messages)}, 400
+
+    except ValueError as e:  # Catch custom @validates errors defined in the model
+        return {"error": "Invalid Content", "message": str(e)}, 400
+
+    except IntegrityError as e:  # Database constraint errors like NOT NULL or UNIQUE
+        await session.rollback()
+        return {"error": "Database Integrity Error", "message": str(e.orig)}, 400
@@ -0,0 +1,87 @@
+"""Async versions of the customer routes for the ASGI serving mode. Statements and
+responses are shared with the synchronous controllers so both modes behave the same."""
+
+from quart import Blueprint, request, jsonify, abort
+from sqlalchemy.exc import IntegrityError
+from marshmallow.exceptions import ValidationError
+from async_extensions import get_session
+from controllers.customers_controllers import (
+    REGION_LEVELS,
+    customers_statement,
+    region_counts_statement,
+    region_counts,
+    invalid_group_by,
+    integrity_error_response,
+)
+from models import Address, Customer
+from schemas import customer_schema, customers_schema, customer_data_schema
+
+customers = Blueprint("customers", __name__, url_prefix="/customers")
+
+
+@customers.route("", methods=["GET"])
+async def get_customers():
+    """Return a page of customers ordered by id, optionally filtered by the country,
+    state and postcode of their address. Pass the id of the last customer as after_id
+    to get the next page."""
+
+    try:
+        stmt = customers_statement(request.args)
+    except ValueError as e:  # Invalid limit or after_id
+        return {"error": "Invalid pagination", "message": str(e)}, 400
+    result = await get_session().scalars(stmt)
+    return jsonify(customers_schema.dump(result))
+
+
+@customers.route("/counts", methods=["GET"])
+async def count_customers_by_region():
+    """Return the number of customers per region, grouped by country, state (default)
+    or postcode and optionally filtered the same way as GET /customers."""
+
+    group_by = request.args.get("group_by", "state")
+    if group_by not in REGION_LEVELS:
+        return invalid_group_by()
+
+    columns = REGION_LEVELS[group_by]
+    rows = await get_session().execute(region_counts_statement(columns, request.args))
+    return jsonify(region_counts(columns, rows))
+
+
+@customers.route("", methods=["POST"])
+async def create_customer():
+    """Create a new customer from a POST request."""
+
+    session = get_session()
+    try:
+        data = await request.get_json()  # Body is read without blocking the event loop
+        if not data:  # Validate that request contains data
+            abort(400, description="No input data provided.")
+
+        fields = customer_data_schema.load(data)
+        # The model's address_id validator looks the address up with a blocking query,
+        # so look it up here with an await and link it through the relationship instead
+        address_id = fields.pop("address_id", None)
+        if not address_id:
+            raise ValueError("address_id cannot be None for customer creation")
+        address = await session.get(Address, address_id)
+        if not address:
+            raise ValueError(
+                f"Invalid Address: Address with id {address_id} does not exist."
+            )
+
+        # Email and phone validators only parse, so they are safe to run on the event
+        # loop. A DNS deliverability check would need to run in asyncio.to_thread
+        customer = Customer(**fields, address=address)
+        session.add(customer)
+        await session.commit()
+        return jsonify(customer_schema.dump(customer)), 201
+
+    except ValidationError as e:  # Marshmallow validation of missing or invalid fields
+        return {"error": "Invalid format", "messages": str(e.messages)}, 400
+
+    except ValueError as e:  # Catch custom @validates errors and invalid address_id
+        return {"error": "Invalid Content", "message": str(e)}, 400
+
+    except IntegrityError as e:  # Database constraint errors like NOT NULL or UNIQUE
+        await session.rollback()
+        return integrity_error_response(e)
@@ -0,0 +1,59 @@
+"""CLI commands for managing the database, registered on the app through a blueprint."""
+
+import click
+from flask import Blueprint
+from extensions import db
+from models import Address, Customer
+from synthetic_data import insert_synthetic_data
+
+db_commands = Blueprint("db", __name__)  # Commands are run with 'flask db <command>'
+
+
+def table_index(model, name):
+    """Return the index of model's table with the given name."""
+
+    return next(index for index in model.__table__.indexes if index.name == name)
+
+
+# Indexes added after the initial schema, created on existing databases by add-indexes.
+# Listed by name so indexes added to these tables later are not picked up as well
+REGION_INDEXES = [
+    table_index(Address, "ix_addresses_country_state_postcode"),
+    table_index(Customer, "ix_customers_address_id"),
+]
+
+
+@db_commands.cli.command("create")
+def create_tables():
+    """Create all tables (and their indexes) that do not exist yet."""
+
+    db.create_all()
+    print("Tables created")
+
+
+@db_commands.cli.command("add-indexes")
+def add_indexes():
+    """Migrate an existing database by creating the region lookup indexes on addresses
+    and customers. Indexes that already exist are skipped, so this is safe to re-run."""
+
+    for index in REGION_INDEXES:
+        index.create(db.engine, checkfirst=True)  # checkfirst skips existing indexes
+        print(f"Index {index.name} ready")
+
+
+@db_commands.cli.command("seed-synthetic")
+@click.option("--customers", default=1_000_000, help="Number of customers to insert.")
+@click.option(
+    "--addresses", type=int, help="Number of addresses, defaults to one per customer."
+)
+@click.option("--seed", default=0, help="Random seed, same seed gives the same data.")
+@click.option("--batch-size", default=10_000, help="Rows per bulk insert.")
+def seed_synthetic(customers, addresses, seed, batch_size):
+    """Bulk insert a deterministic synthetic dataset of valid addresses and customers
+    for scale testing, after any rows already in the database."""
+
+    inserted = insert_synthetic_data(customers, addresses, seed, batch_size)
+    print(
+        f"Inserted {inserted['addresses']:,} addresses "
+        f"and {inserted['customers']:,} customers"
+    )
@@ -1,13 +1,146 @@
 from flask import Blueprint, request, jsonify, abort
 from sqlalchemy.exc import IntegrityError
 from marshmallow.exceptions import ValidationError
-from psycopg2 import errorcodes, IntegrityError as PGIntegrityError
-import sqlite3
+from psycopg2 import errorcodes
 from extensions import db
-from schemas import customer_schema
+from models import Address, Customer
+from schemas import customer_schema, customers_schema
 
 customers = Blueprint("customers", __name__, url_prefix="/customers")
 
+# Region levels in the same order as the composite index on Address, so grouping by a
+# level always groups by a leftmost prefix of ix_addresses_country_state_postcode
+REGION_LEVELS = {
+    "country": (Address.country_code,),
+    "state": (Address.country_code, Address.state_code),
+    "postcode": (Address.country_code, Address.state_code, Address.postcode),
+}
+PAGE_SIZE = 100  # Customers per page of GET /customers unless 'limit' is given
+MAX_PAGE_SIZE = 1000  # Largest 'limit' accepted, keeps responses bounded on big tables
+
+
+def filter_by_region(stmt, args):
+    """Apply the optional country, state and postcode query parameters in args to a
+    statement that already joins Customer to Address."""
+
+    country = args.get("country")
+    state = args.get("state")
+    postcode = args.get("postcode")
+
+    if country:  # Codes are stored uppercase by the Address validators
+        stmt = stmt.where(Address.country_code == country.upper())
+    if state:
+        stmt = stmt.where(Address.state_code == state.upper())
+    if postcode:
+        stmt = stmt.where(Address.postcode == postcode)
+    return stmt
+
+
+def customers_statement(args):
+    """Return the statement selecting one page of customers, filtered by the region in
+    args. Pages are keyset paginated on id: 'limit' customers (default PAGE_SIZE, at
+    most MAX_PAGE_SIZE) with an id greater than 'after_id'. Raises ValueError if the
+    pagination parameters are not valid."""
+
+    try:
+        limit = int(args.get("limit", PAGE_SIZE))
+        after_id = int(args.get("after_id", 0))
+    except ValueError:
+        raise ValueError("limit and after_id must be integers") from None
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+    stmt = (
+        db.select(Customer)
+        .where(Customer.id > after_id)
+        .order_by(Customer.id)
+        .limit(limit)
+    )
+    if any(args.get(key) for key in ("country", "state", "postcode")):
+        # Inner join, as customers whose address was deleted have no region to match
+        stmt = filter_by_region(stmt.join(Customer.address), args)
+    return stmt  # Without a region filter no join is needed, so every customer is listed
+
+
+def region_counts_statement(columns, args):
+    """Return the statement counting customers per region, grouped by columns."""
+
+    return filter_by_region(
+        db.select(*columns, db.func.count(Customer.id).label("count"))
+        .select_from(Customer)
+        .join(Customer.address)
+        .group_by(*columns)
+        .order_by(*columns),
+        args,
+    )
+
+
+def region_counts(columns, rows):
+    """Label each row of region counts by column name without the "_code" suffix,
+    e.g. {"country": "AU", "count": 3}."""
+
+    keys = [column.key.removesuffix("_code") for column in columns]
+    return [{**dict(zip(keys, row[:-1])), "count": row.count} for row in rows]
+
+
+def invalid_group_by():
+    """Error response for a group_by that is not one of REGION_LEVELS."""
+
+    return {
+        "error": "Invalid group_by",
+        "message": f"group_by must be one of {', '.join(REGION_LEVELS)}",
+    }, 400
+
+
+def integrity_error_response(error):
+    """Return the error response for an IntegrityError raised while creating a
+    customer. PostgreSQL errors carry the SQLSTATE as pgcode with both psycopg2 and
+    asyncpg, SQLite errors only have the message."""
+
+    pgcode = getattr(error.orig, "pgcode", None)
+    if pgcode == errorcodes.UNIQUE_VIOLATION or (
+        "UNIQUE constraint failed" in str(error.orig)
+    ):
+        return {"error": "Email already exists", "message": str(error.orig)}, 409
+    if pgcode == errorcodes.NOT_NULL_VIOLATION:
+        # psycopg2 reports the column in diag, asyncpg on the error it wraps
+        diag = getattr(error.orig, "diag", error.orig.__cause__)
+        return {
+            "error": "Required field missing",
+            "field": str(getattr(diag, "column_name", None)),
+        }, 400
+    return {  # Catch missed IntegrityError's
+        "error": "Database Integrity Error",
+        "message": str(error.orig),
+    }, 400  # General error message for miscellaneous integrity issues
+
+
+@customers.route("", methods=["GET"])
+def get_customers():
+    """Return a page of customers ordered by id, optionally filtered by the country,
+    state and postcode of their address. Pass the id of the last customer as after_id
+    to get the next page."""
+
+    try:
+        stmt = customers_statement(request.args)
+    except ValueError as e:  # Invalid limit or after_id
+        return {"error": "Invalid pagination", "message": str(e)}, 400
+    return jsonify(customers_schema.dump(db.session.scalars(stmt)))
+
+
+@customers.route("/counts", methods=["GET"])
+def count_customers_by_region():
+    """Return the number of customers per region, grouped by country, state (default)
+    or postcode and optionally filtered the same way as GET /customers."""
+
+    group_by = request.args.get("group_by", "state")
+    if group_by not in REGION_LEVELS:
+        return invalid_group_by()
+
+    columns = REGION_LEVELS[group_by]
+    stmt = region_counts_statement(columns, request.args)
+    return jsonify(region_counts(columns, db.session.execute(stmt)))
+
 
 @customers.route("", methods=["POST"])
 def create_customer():
@@ -40,21 +173,4 @@ def create_customer():
 
     except IntegrityError as e:  # Database constraint errors like NOT NULL or UNIQUE
         db.session.rollback()  # Rollback required as IntegrityError occurs after adding to session
-
-        if isinstance(e.orig, sqlite3.IntegrityError):  # Checks if sqlite db
-            if "UNIQUE constraint failed" in str(e.orig):
-                # Checks if db unique violation
-                return {"error": "Email already exists", "message": str(e.orig)}, 409
-
-        elif isinstance(e.orig, PGIntegrityError):  # Checks if PostgreSQL db
-            if e.orig.pgcode == errorcodes.NOT_NULL_VIOLATION:
-                return {  # if NOT NULL violation
-                    "error": "Required field missing",
-                    "field": str(e.orig.diag.column_name),
-                }, 400
-            elif e.orig.pgcode == errorcodes.UNIQUE_VIOLATION:  # If UNIQUE violation
-                return {"error": "Email already exists", "message": str(e.orig)}, 409
-        return {  # Catch missed IntegrityError's
-            "error": "Database Integrity Error",
-            "message": str(e.orig),
-        }, 400  # General error message for miscellaneous integrity issues
+        return integrity_error_response(e)
@@ -5,6 +5,7 @@ from flask import Flask
 from sqlalchemy import event
 from sqlalchemy.engine import Engine
 from extensions import db
+from profiler import init_profiler
 
 
 def create_app(config_class="config.DevConfig"):
@@ -14,6 +15,7 @@ def create_app(config_class="config.DevConfig"):
     app.config.from_object(config_class)  # Loads the relevant config from config.py
     # after being passed as a string as an argument in create_app()
     db.init_app(app)  # Initialize database using app instance
+    init_profiler(app)  # Only attaches the profiler if PROFILER_ENABLED is set
 
     @event.listens_for(Engine, "connect")  # Listens for database engine connection
     def set_sqlite_pragma(
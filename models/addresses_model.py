@@ -8,6 +8,16 @@ class Address(db.Model):
     """Model for storing addresses of customers."""
 
     __tablename__ = "addresses"
+    __table_args__ = (
+        # Composite index ordered broadest to narrowest so country, country + state and
+        # country + state + postcode lookups can all use the same index (leftmost prefix)
+        db.Index(
+            "ix_addresses_country_state_postcode",
+            "country_code",
+            "state_code",
+            "postcode",
+        ),
+    )
     id = db.Column(db.Integer, primary_key=True)
     country_code = db.Column(db.String(2), nullable=False)  # Enforces max length of 2
     state_code = db.Column(db.String(3), nullable=False)  # Enforces max length of 3
@@ -26,6 +26,7 @@ class Customer(db.Model):
             "addresses.id", ondelete="SET NULL"
         ),  # 'ondelete' tells database to set null on parent (address) deletion
         nullable=True,  # address_id needs to allow nullable for address deletion/change
+        index=True,  # Index FK so joins and lookups from Address to Customer avoid full scans
     )
     # Many to one relationship with address
     address = db.relationship("Address", back_populates="customers")
@@ -39,6 +40,11 @@ class Customer(db.Model):
         if self.id and not address_id:  # Skips if customer instance already exists
             return address_id
         if address_id:
+            # Skip the lookup if the address is already linked through the relationship,
+            # read from __dict__ so checking never triggers a lazy load
+            linked = self.__dict__.get("address")
+            if linked is not None and linked.id == address_id:
+                return address_id
             address = db.session.get(Address, address_id)
             if not address:
                 raise ValueError(
@@ -0,0 +1,226 @@
+"""Sampling profiler for finding where request time is spent in production.
+
+When PROFILER_ENABLED is set, a fraction (PROFILER_SAMPLE_RATE) of requests is marked
+for profiling. A background thread samples the Python stack of every marked request
+every PROFILER_INTERVAL seconds and counts identical stacks per endpoint. Counts are
+written every PROFILER_FLUSH_INTERVAL seconds in collapsed stack format, one
+'<endpoint>.<pid>.folded' file per endpoint and worker process, which flamegraph.pl
+and speedscope turn into flame graphs. Files rotate like log files once they reach
+PROFILER_MAX_BYTES, keeping PROFILER_BACKUP_COUNT old files. Workers replaced by the
+server leave their files behind, so after each flush the oldest files in PROFILER_DIR
+are deleted until all of them together fit in PROFILER_MAX_TOTAL_BYTES."""
+
+import atexit
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from logging.handlers import RotatingFileHandler
+from weakref import WeakSet
+from flask import request
+
+# Profilers that have not been stopped, held weakly so apps can still be freed
+running_profilers = WeakSet()
+
+
+class SamplingProfiler:
+    """Samples the stacks of marked request threads and aggregates them per endpoint."""
+
+    def __init__(self, config):
+        """Read settings from the PROFILER_* keys of a Flask config."""
+
+        self.sample_rate = config["PROFILER_SAMPLE_RATE"]
+        self.interval = config["PROFILER_INTERVAL"]
+        self.flush_interval = config["PROFILER_FLUSH_INTERVAL"]
+        self.directory = config["PROFILER_DIR"]
+        self.max_bytes = config["PROFILER_MAX_BYTES"]
+        self.backup_count = config["PROFILER_BACKUP_COUNT"]
+        self.max_total_bytes = config["PROFILER_MAX_TOTAL_BYTES"]
+
+        self.active = {}  # Thread id of each marked request mapped to its endpoint
+        self.stacks = defaultdict(Counter)  # Endpoint mapped to sample count per stack
+        self.handlers = {}  # Endpoint mapped to the rotating file it is written to
+        self.lock = threading.Lock()  # Guards stacks and handlers
+        # Guards active and stopped, the sampler thread waits on it while no request
+        # is marked so an idle profiler costs nothing
+        self.wake = threading.Condition()
+        self.stopped = False
+        self.thread = None
+        self.pid = None
+
+    def start_request(self):
+        """Mark the current request for sampling with probability sample_rate."""
+
+        if random.random() >= self.sample_rate or not self.ensure_sampler():
+            return
+        with self.wake:
+            self.active[threading.get_ident()] = request.endpoint or "unmatched"
+            self.wake.notify()  # Wake the sampler if it is parked
+
+    def end_request(self, exc=None):
+        """Stop sampling the current request, exc is passed by teardown_request."""
+
+        with self.wake:
+            self.active.pop(threading.get_ident(), None)
+
+    def ensure_sampler(self):
+        """Start the sampler thread, again in each worker after a fork as threads are
+        not copied into forked processes. Returns False once the profiler is stopped."""
+
+        if self.stopped:
+            return False
+        if self.thread and self.thread.is_alive() and self.pid == os.getpid():
+            return True
+        with self.lock:
+            if self.thread and self.thread.is_alive() and self.pid == os.getpid():
+                return True  # Another request started it while waiting for the lock
+            if self.pid != os.getpid():
+                # State copied from the parent process belongs to its threads and files
+                for handler in self.handlers.values():
+                    handler.close()
+                self.handlers = {}
+                self.stacks = defaultdict(Counter)
+                with self.wake:
+                    self.active = {}
+            self.pid = os.getpid()
+            self.thread = threading.Thread(
+                target=self.run, name="sampling-profiler", daemon=True
+            )
+            self.thread.start()
+        return True
+
+    def stop(self):
+        """End the sampler thread, write the remaining samples and close the files."""
+
+        with self.wake:
+            self.stopped = True
+            self.wake.notify_all()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.flush()
+        with self.lock:
+            for handler in self.handlers.values():
+                handler.close()
+            self.handlers = {}
+        running_profilers.discard(self)
+
+    def run(self):
+        """Sampler thread loop, samples marked requests every interval and flushes
+        every flush_interval. Parks while no request is marked, only waking to flush."""
+
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            with self.wake:
+                self.wake.wait_for(
+                    lambda: self.active or self.stopped,
+                    timeout=max(0, next_flush - time.monotonic()),
+                )
+                if self.stopped:
+                    return
+                active = list(self.active.items())
+
+            if active:
+                self.sample(active)
+            if time.monotonic() >= next_flush:
+                self.flush()
+                next_flush = time.monotonic() + self.flush_interval
+            if active:
+                with self.wake:  # Sleep for the interval unless stopped meanwhile
+                    self.wake.wait_for(lambda: self.stopped, timeout=self.interval)
+
+    def sample(self, active):
+        """Record the current stack of each (thread id, endpoint) in active."""
+
+        frames = sys._current_frames()  # Thread id mapped to its innermost frame
+        for thread_id, endpoint in active:
+            frame = frames.get(thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:  # Walk from the innermost frame to the root
+                module = frame.f_globals.get("__name__", "?")
+                stack.append(f"{module}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            with self.lock:
+                self.stacks[endpoint][";".join(reversed(stack))] += 1
+
+    def flush(self):
+        """Append collected stacks to each endpoint's collapsed stack file and reset
+        the counts. Files can hold the same stack more than once, which flame graph
+        tools sum."""
+
+        with self.lock:
+            stacks, self.stacks = self.stacks, defaultdict(Counter)
+            handlers = {endpoint: self.handler(endpoint) for endpoint in stacks}
+        for endpoint, counts in stacks.items():
+            handler = handlers[endpoint]  # Handlers lock themselves while writing
+            for stack, count in counts.items():
+                handler.handle(logging.makeLogRecord({"msg": f"{stack} {count}"}))
+            handler.flush()
+        if stacks:
+            self.prune()
+
+    def prune(self):
+        """Delete the oldest collapsed stack files in the directory, from any worker,
+        until their total size fits in max_total_bytes. Files this process is writing
+        to are kept."""
+
+        with self.lock:
+            current = {handler.baseFilename for handler in self.handlers.values()}
+        files = []
+        for entry in os.scandir(self.directory):
+            if ".folded" in entry.name and entry.path not in current:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # Rotated or pruned by another worker
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files) + sum(
+            os.path.getsize(path) for path in current if os.path.exists(path)
+        )
+        for _, size, path in sorted(files):  # Oldest first
+            if total <= self.max_total_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:  # Already pruned by another worker
+                pass
+            total -= size
+
+    def handler(self, endpoint):
+        """Return the rotating file handler for an endpoint, creating it on first use.
+        Must be called with lock held."""
+
+        if endpoint not in self.handlers:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"{endpoint}.{os.getpid()}.folded")
+            handler = RotatingFileHandler(
+                path, maxBytes=self.max_bytes, backupCount=self.backup_count
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.handlers[endpoint] = handler
+        return self.handlers[endpoint]
+
+
+def init_profiler(app):
+    """Attach a SamplingProfiler to app if PROFILER_ENABLED is set in its config."""
+
+    if not app.config.get("PROFILER_ENABLED"):
+        return None
+    profiler = SamplingProfiler(app.config)
+    app.before_request(profiler.start_request)
+    app.teardown_request(profiler.end_request)
+    running_profilers.add(profiler)  # Stopped by stop_profilers at exit
+    app.extensions["profiler"] = profiler  # Lets tests and benchmarks flush samples
+    return profiler
+
+
+@atexit.register
+def stop_profilers():
+    """Stop every running profiler on shutdown so samples not yet flushed are written."""
+
+    for profiler in list(running_profilers):
+        profiler.stop()
@@ -1,4 +1,14 @@
 """Initialization file for importing schemas."""
 
-from .addresses_schema import AddressSchema, address_schema, addresses_schema
-from .customers_schema import CustomerSchema, customer_schema, customers_schema
+from .addresses_schema import (
+    AddressSchema,
+    address_schema,
+    addresses_schema,
+    address_data_schema,
+)
+from .customers_schema import (
+    CustomerSchema,
+    customer_schema,
+    customers_schema,
+    customer_data_schema,
+)
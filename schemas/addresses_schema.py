@@ -25,3 +25,6 @@ address_schema = (
 addresses_schema = AddressSchema(
     many=True
 )  # Instance of schema for use in routes on multiple addresses
+address_data_schema = AddressSchema(
+    load_instance=False
+)  # Loads validated fields as a dict without a session, for the async controllers
@@ -26,3 +26,6 @@ customer_schema = (
 customers_schema = CustomerSchema(
     many=True
 )  # Instance of schema for use in routes on multiple customers
+customer_data_schema = CustomerSchema(
+    load_instance=False
+)  # Loads validated fields as a dict without a session, for the async controllers
@@ -0,0 +1,240 @@
+"""Generate large, valid synthetic datasets for scale testing and benchmarks.
+
+Rows are produced lazily in batches from a seeded random generator and written with
+bulk inserts, so the same seed always produces the same data and memory use stays
+flat no matter how many rows are requested. Bulk inserts bypass the model validators,
+so every value generated here is already in the form the validators would store."""
+
+import random
+import phonenumbers
+from extensions import db
+from models import Address, Customer
+
+# ISO 3166-1 country codes mapped to the postcode format of the country, where '#' is
+# a digit and '?' an uppercase letter, and ISO 3166-2 subdivision codes mapped to a
+# city in that subdivision
+REGIONS = {
+    "AU": {
+        "postcode": "####",
+        "states": {
+            "NSW": "Sydney",
+            "VIC": "Melbourne",
+            "QLD": "Brisbane",
+            "WA": "Perth",
+            "SA": "Adelaide",
+            "TAS": "Hobart",
+            "ACT": "Canberra",
+            "NT": "Darwin",
+        },
+    },
+    "US": {
+        "postcode": "#####",
+        "states": {
+            "CA": "Los Angeles",
+            "NY": "New York",
+            "TX": "Houston",
+            "FL": "Miami",
+            "WA": "Seattle",
+            "IL": "Chicago",
+            "PA": "Philadelphia",
+            "GA": "Atlanta",
+        },
+    },
+    "GB": {
+        "postcode": "??# #??",
+        "states": {
+            "ENG": "London",
+            "SCT": "Edinburgh",
+            "WLS": "Cardiff",
+            "NIR": "Belfast",
+        },
+    },
+    "NZ": {
+        "postcode": "####",
+        "states": {
+            "AUK": "Auckland",
+            "WGN": "Wellington",
+            "CAN": "Christchurch",
+            "OTA": "Dunedin",
+        },
+    },
+    "CA": {
+        "postcode": "?#? #?#",
+        "states": {
+            "ON": "Toronto",
+            "QC": "Montreal",
+            "BC": "Vancouver",
+            "AB": "Calgary",
+        },
+    },
+    "DE": {
+        "postcode": "#####",
+        "states": {
+            "BE": "Berlin",
+            "BY": "Munich",
+            "HH": "Hamburg",
+            "HE": "Frankfurt",
+        },
+    },
+    "IN": {
+        "postcode": "######",
+        "states": {
+            "MH": "Mumbai",
+            "KA": "Bengaluru",
+            "DL": "New Delhi",
+            "TN": "Chennai",
+        },
+    },
+}
+
+FIRST_NAMES = [
+    "Olivia", "Liam", "Emma", "Noah", "Amelia", "Oliver", "Ava", "Elijah", "Sophia",
+    "James", "Isla", "William", "Mia", "Lucas", "Aroha", "Arjun", "Hannah", "Felix",
+]  # fmt: skip
+LAST_NAMES = [
+    "Smith", "Jones", "Williams", "Brown", "Wilson", "Taylor", "Nguyen", "Singh",
+    "Martin", "Müller", "Walker", "Patel", "Clarke", "Roberts", "Ngata", "Davies",
+]  # fmt: skip
+STREET_NAMES = [
+    "High", "Station", "Church", "Victoria", "Park", "George", "King", "Queen",
+    "Elizabeth", "Main", "Oak", "Maple", "Hill", "River", "Beach", "Mill",
+]  # fmt: skip
+STREET_TYPES = ["St", "Rd", "Ave", "Lane", "Drive", "Way", "Pde", "Cres"]
+
+# Mobile number for each country from phonenumbers metadata, used as the template
+# for generated phone numbers (country calling code, national number)
+PHONE_TEMPLATES = {
+    country: phonenumbers.example_number_for_type(
+        country, phonenumbers.PhoneNumberType.MOBILE
+    )
+    for country in REGIONS
+}
+PHONE_RANDOM_DIGITS = 6  # Trailing digits of the template number that are randomised
+
+
+def random_postcode(rng, pattern):
+    """Return a postcode following pattern, '#' becoming a digit and '?' a letter."""
+
+    return "".join(
+        (
+            str(rng.randrange(10))
+            if char == "#"
+            else chr(rng.randrange(65, 91)) if char == "?" else char
+        )
+        for char in pattern
+    )
+
+
+def random_phone(rng, country):
+    """Return a valid E.164 mobile number for country by randomising the trailing
+    digits of the example number, retrying until phonenumbers accepts it as valid."""
+
+    template = PHONE_TEMPLATES[country]
+    prefix = str(template.national_number)[:-PHONE_RANDOM_DIGITS]
+    while True:
+        digits = rng.randrange(10**PHONE_RANDOM_DIGITS)
+        number = phonenumbers.PhoneNumber(
+            country_code=template.country_code,
+            national_number=int(f"{prefix}{digits:0{PHONE_RANDOM_DIGITS}d}"),
+        )
+        # Checking against the known region skips the region lookup is_valid_number does
+        if phonenumbers.is_valid_number_for_region(number, country):
+            return phonenumbers.format_number(
+                number, phonenumbers.PhoneNumberFormat.E164
+            )
+
+
+def batched(rows, batch_size):
+    """Group an iterable of rows into lists of at most batch_size rows."""
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def address_rows(rng, count, start_id=1):
+    """Yield count address rows with ids starting at start_id."""
+
+    countries = list(REGIONS)
+    for address_id in range(start_id, start_id + count):
+        country = rng.choice(countries)
+        region = REGIONS[country]
+        state, city = rng.choice(list(region["states"].items()))
+        yield {
+            "id": address_id,
+            "country_code": country,
+            "state_code": state,
+            "city": city,
+            "street": f"{rng.randint(1, 999)} {rng.choice(STREET_NAMES)} "
+            f"{rng.choice(STREET_TYPES)}",
+            "postcode": random_postcode(rng, region["postcode"]),
+        }
+
+
+def customer_rows(rng, count, address_ids, start_id=1):
+    """Yield count customer rows with ids starting at start_id, each linked to an
+    address with an id in the range address_ids."""
+
+    countries = list(REGIONS)
+    for customer_id in range(start_id, start_id + count):
+        f_name = rng.choice(FIRST_NAMES)
+        l_name = rng.choice(LAST_NAMES)
+        yield {
+            "id": customer_id,
+            "f_name": f_name,
+            "l_name": l_name,
+            # Customer id keeps emails unique, ASCII lowercase is already normalized
+            "email": f"{f_name}.{customer_id}@example.com".lower(),
+            "phone": random_phone(rng, rng.choice(countries)),
+            "address_id": rng.choice(address_ids),
+        }
+
+
+def next_id(model):
+    """Return the first unused primary key of model, so new rows follow existing ones."""
+
+    return (db.session.scalar(db.select(db.func.max(model.id))) or 0) + 1
+
+
+def sync_id_sequence(model):
+    """Move the PostgreSQL id sequence of model past the explicitly inserted ids, so
+    rows created through the API afterwards do not collide with them."""
+
+    if db.session.get_bind().dialect.name == "postgresql":
+        table = model.__tablename__
+        db.session.execute(
+            db.text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT max(id) FROM {table}))"
+            )
+        )
+
+
+def insert_synthetic_data(customers, addresses=None, seed=0, batch_size=10_000):
+    """Bulk insert synthetic addresses and customers after any existing rows, needs an
+    app context. Defaults to one address per customer. Returns the number of rows
+    inserted per table."""
+
+    addresses = customers if addresses is None else addresses
+    if customers and not addresses:
+        raise ValueError("Customers require at least one address to link to")
+
+    rng = random.Random(seed)  # Private generator so output depends only on the seed
+    address_start = next_id(Address)
+    for batch in batched(address_rows(rng, addresses, address_start), batch_size):
+        db.session.execute(db.insert(Address), batch)
+
+    address_ids = range(address_start, address_start + addresses)
+    rows = customer_rows(rng, customers, address_ids, next_id(Customer))
+    for batch in batched(rows, batch_size):
+        db.session.execute(db.insert(Customer), batch)
+
+    for model in (Address, Customer):
+        sync_id_sequence(model)
+    db.session.commit()
+    return {"addresses": addresses, "customers": customers}
@@ -0,0 +1,20 @@
+"""Fixtures shared by the benchmark suites."""
+
+import pytest
+from synthetic_data import insert_synthetic_data
+
+
+@pytest.fixture
+def synthetic_data(request):
+    """Return a function that bulk inserts a seeded synthetic dataset, taking the same
+    arguments as insert_synthetic_data plus the app whose database to fill. Without an
+    app it fills the shared test app from tests/conftest.py, so benchmarks that build
+    their own apps (other configs, file databases) pass theirs in."""
+
+    def load(customers, addresses=None, seed=0, batch_size=10_000, app=None):
+        # Only set up the shared app when it is the one being filled
+        app = app or request.getfixturevalue("app")
+        with app.app_context():
+            return insert_synthetic_data(customers, addresses, seed, batch_size)
+
+    return load
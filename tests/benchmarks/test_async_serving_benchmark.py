@@ -0,0 +1,182 @@
+"""Benchmark of requests per second and memory per concurrent connection for gunicorn
+sync workers (main.py) against the async serving mode under hypercorn (asgi.py), both
+run with the same number of worker processes.
+Skipped unless RUN_BENCHMARKS is set, run with:
+    RUN_BENCHMARKS=1 python -m pytest tests/benchmarks -s -k serving"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+import pytest
+from config import DevConfig
+from extensions import db
+from main import create_app
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("RUN_BENCHMARKS"), reason="Set RUN_BENCHMARKS=1 to run benchmarks"
+)
+
+CONCURRENCY = int(os.getenv("BENCHMARK_CONCURRENCY", "50"))  # Open connections
+DURATION = float(os.getenv("BENCHMARK_DURATION", "10"))  # Seconds per server
+CUSTOMERS = 100_000  # Size of the dataset the lookups run against
+WORKERS = int(os.getenv("BENCHMARK_WORKERS", "2"))  # Worker processes per server
+
+URLS = [  # Indexed region lookups cycled through by each connection, kept narrow so
+    # time is spent waiting on the database and serving rather than serializing
+    "/customers?country=NZ&state=OTA&postcode=9016",
+    "/customers?country=AU&state=VIC&postcode=3000",
+    "/customers/counts?country=NZ&state=AUK&postcode=1010&group_by=postcode",
+]
+
+SERVERS = {  # Command line of each server being compared, {port} is filled in
+    "gunicorn sync": [
+        sys.executable, "-m", "gunicorn", "-w", str(WORKERS),
+        "-b", "127.0.0.1:{port}", "main:create_app()",
+    ],
+    "hypercorn async": [
+        sys.executable, "-m", "hypercorn", "-w", str(WORKERS),
+        "-b", "127.0.0.1:{port}", "asgi:create_asgi_app()",
+    ],
+}  # fmt: skip
+
+
+def free_port():
+    """Return a TCP port that is free on localhost."""
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_kb(pid):
+    """Return the resident memory in kB of a process and all of its children."""
+
+    total = 0
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                total += int(line.split()[1])
+    with open(f"/proc/{pid}/task/{pid}/children") as children:
+        for child in children.read().split():
+            total += rss_kb(int(child))
+    return total
+
+
+async def get(port, url):
+    """Make one GET request on a new connection and return the status code."""
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET {url} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode()
+    )
+    await writer.drain()
+    response = await reader.read()  # Server closes the connection when done
+    writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+async def load(port, pid):
+    """Run CONCURRENCY connections for DURATION seconds, return the number of OK
+    responses and the peak memory of the server while under load."""
+
+    deadline = time.perf_counter() + DURATION
+    completed = 0
+    peak_rss = 0
+
+    async def connection(offset):
+        nonlocal completed
+        i = offset
+        while time.perf_counter() < deadline:
+            assert await get(port, URLS[i % len(URLS)]) == 200
+            completed += 1
+            i += 1
+
+    async def monitor():
+        nonlocal peak_rss
+        while time.perf_counter() < deadline:
+            peak_rss = max(peak_rss, rss_kb(pid))
+            await asyncio.sleep(0.5)
+
+    await asyncio.gather(monitor(), *(connection(i) for i in range(CONCURRENCY)))
+    return completed, peak_rss
+
+
+def wait_for_server(port, timeout=30):
+    """Wait until the server accepts connections."""
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Server on port {port} did not start")
+
+
+async def get_all_once(port):
+    """Request every URL a few times so lazy imports do not count towards the load."""
+
+    for _ in range(WORKERS):
+        for url in URLS:
+            assert await get(port, url) == 200
+
+
+def test_async_serving_benchmark(tmp_path, synthetic_data):
+    """Serve the same database with each server and drive the same load at both."""
+
+    database_uri = f"sqlite:///{tmp_path / 'bench.db'}"
+    app = create_app(
+        type("BenchConfig", (DevConfig,), {"SQLALCHEMY_DATABASE_URI": database_uri})
+    )
+    with app.app_context():
+        db.create_all()
+    synthetic_data(CUSTOMERS, seed=42, app=app)
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = {**os.environ, "DEV_DATABASE_URI": database_uri}
+    results = {}
+    for name, command in SERVERS.items():
+        port = free_port()
+        server = subprocess.Popen(
+            [part.format(port=port) for part in command],
+            cwd=root,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_server(port)
+            asyncio.run(get_all_once(port))  # Warm up every worker's imports and caches
+            idle_rss = rss_kb(server.pid)
+            completed, peak_rss = asyncio.run(load(port, server.pid))
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:  # Skip graceful shutdown if it hangs
+                server.kill()
+                server.wait()
+        results[name] = (completed / DURATION, idle_rss, peak_rss)
+
+    print(
+        f"\n{CONCURRENCY} concurrent connections for {DURATION:.0f}s per server, "
+        f"{WORKERS} workers each"
+    )
+    print(
+        f"{'server':<18}{'req/s':>8}{'req/s/worker':>14}{'idle MB':>9}{'load MB':>9}"
+        f"{'KB/conn':>9}"
+    )
+    for name, (rps, idle_rss, peak_rss) in results.items():
+        # Memory the open connections add on top of the idle server, shared equally
+        per_connection = (peak_rss - idle_rss) / CONCURRENCY
+        print(
+            f"{name:<18}{rps:>8.0f}{rps / WORKERS:>14.0f}{idle_rss / 1024:>9.1f}"
+            f"{peak_rss / 1024:>9.1f}{per_connection:>9.0f}"
+        )
+
+    assert all(result[0] > 0 for result in results.values())
+
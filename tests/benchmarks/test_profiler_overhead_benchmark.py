@@ -0,0 +1,82 @@
+"""Benchmark of the request overhead added by the sampling profiler.
+Skipped unless RUN_BENCHMARKS is set, run with:
+    RUN_BENCHMARKS=1 python -m pytest tests/benchmarks -s -k profiler"""
+
+import os
+import time
+import pytest
+from config import TestConfig
+from extensions import db
+from main import create_app
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("RUN_BENCHMARKS"), reason="Set RUN_BENCHMARKS=1 to run benchmarks"
+)
+
+REQUESTS = int(os.getenv("BENCHMARK_REQUESTS", "1000"))  # Requests per endpoint
+WARMUP = 50  # Untimed requests per mode so caches and connections are warm
+CUSTOMERS = 10_000  # Size of the dataset the GET lookups run against
+
+MODES = {  # Profiler config of each mode being compared
+    "disabled": {"PROFILER_ENABLED": False},
+    "sample 1%": {"PROFILER_ENABLED": True, "PROFILER_SAMPLE_RATE": 0.01},
+    "sample 100%": {"PROFILER_ENABLED": True, "PROFILER_SAMPLE_RATE": 1.0},
+}
+
+
+def time_requests(app):
+    """Return the mean time in milliseconds of a region lookup and a customer
+    creation, the latter going through marshmallow, the validators and a flush."""
+
+    client = app.test_client()
+    for _ in range(WARMUP):
+        client.get("/customers?country=NZ&state=OTA")
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        assert client.get("/customers?country=NZ&state=OTA").status_code == 200
+    lookup = (time.perf_counter() - start) * 1000 / REQUESTS
+
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        response = client.post(
+            "/customers",
+            json={
+                "f_name": "Bench",
+                "email": f"bench.{i}@example.com",
+                "phone": "+61412345678",
+                "address_id": 1,
+            },
+        )
+        assert response.status_code == 201
+    create = (time.perf_counter() - start) * 1000 / REQUESTS
+    return {"GET /customers": lookup, "POST /customers": create}
+
+
+def test_profiler_overhead_benchmark(tmp_path, synthetic_data):
+    """Time the same requests with the profiler disabled and at two sample rates."""
+
+    results = {}
+    for mode, config in MODES.items():
+        profiler_config = type(
+            "ProfilerConfig", (TestConfig,), {"PROFILER_DIR": str(tmp_path), **config}
+        )
+        app = create_app(profiler_config)
+        with app.app_context():
+            db.create_all()
+        synthetic_data(CUSTOMERS, seed=42, app=app)
+        results[mode] = time_requests(app)
+        if "profiler" in app.extensions:
+            app.extensions["profiler"].stop()  # Ends the sampler before the next mode
+
+    baseline = results["disabled"]
+    print(f"\nProfiler overhead over {REQUESTS:,} requests (mean ms per request)")
+    print(f"{'mode':<14}{'endpoint':<18}{'mean ms':>10}{'overhead':>10}")
+    for mode, timings in results.items():
+        for endpoint, mean in timings.items():
+            overhead = (mean / baseline[endpoint] - 1) * 100
+            print(f"{mode:<14}{endpoint:<18}{mean:>10.2f}{overhead:>9.1f}%")
+
+    # Production setting should stay within noise of running without the profiler
+    for endpoint, mean in results["sample 1%"].items():
+        assert mean < baseline[endpoint] * 1.1
@@ -0,0 +1,63 @@
+"""Benchmark of geographic customer lookups before and after adding the region indexes.
+Skipped unless RUN_BENCHMARKS is set, run with:
+    RUN_BENCHMARKS=1 BENCHMARK_ROWS=1000000 python -m pytest tests/benchmarks -s"""
+
+import os
+import time
+from statistics import median
+import pytest
+from extensions import db
+from controllers.cli_controllers import REGION_INDEXES
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("RUN_BENCHMARKS"), reason="Set RUN_BENCHMARKS=1 to run benchmarks"
+)
+
+ROWS = int(os.getenv("BENCHMARK_ROWS", "1000000"))  # Rows per table
+REPEATS = 5  # Each lookup is timed this many times and the median is reported
+
+LOOKUPS = {  # URL of each lookup being compared
+    "country": "/customers?country=NZ",
+    "country + state": "/customers?country=AU&state=TAS",
+    "country + state + postcode": "/customers?country=US&state=NY&postcode=10001",
+    "counts by state": "/customers/counts?country=GB",
+}
+
+
+def time_lookups(client):
+    """Return the median time in milliseconds of each lookup in LOOKUPS."""
+
+    results = {}
+    for name, url in LOOKUPS.items():
+        timings = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200
+        results[name] = median(timings)
+    return results
+
+
+def test_region_lookup_benchmark(app, client, synthetic_data):
+    """Time region lookups without the region indexes, then again after adding them."""
+
+    with app.app_context():
+        for index in REGION_INDEXES:  # Start from the schema as it was before the indexes
+            index.drop(db.engine, checkfirst=True)
+        synthetic_data(ROWS, seed=42)
+
+        before = time_lookups(client)
+        for index in REGION_INDEXES:  # Same operation as 'flask db add-indexes'
+            index.create(db.engine, checkfirst=True)
+        db.session.execute(db.text("ANALYZE"))  # Refresh planner statistics
+        after = time_lookups(client)
+
+    print(f"\nRegion lookups over {ROWS:,} customers and addresses (median ms)")
+    print(f"{'lookup':<28}{'before':>10}{'after':>10}{'speedup':>10}")
+    for name in LOOKUPS:
+        speedup = before[name] / after[name]
+        print(f"{name:<28}{before[name]:>10.1f}{after[name]:>10.1f}{speedup:>9.1f}x")
+
+    # Narrowest lookup reads a handful of rows through the index instead of a full scan
+    assert after["country + state + postcode"] < before["country + state + postcode"]
@@ -0,0 +1,132 @@
+"""Test cases for the async (ASGI) serving mode, run against the same in-memory
+SQLite database setup as the synchronous tests but through aiosqlite."""
+
+import asyncio
+import pytest
+from asgi import create_asgi_app
+from async_extensions import async_database_uri
+from extensions import db
+
+
+@pytest.fixture(scope="module")
+def loop():
+    """Event loop shared by the module. The in-memory database is a single aiosqlite
+    connection tied to the loop it was opened on, so every test runs on this one."""
+
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()  # After asgi_app, which depends on it, has disposed the engine
+
+
+@pytest.fixture(scope="module")
+def asgi_app(loop):
+    """Create a Quart application with the test configuration and its tables."""
+
+    app = create_asgi_app("config.TestConfig")
+
+    async def create_tables():
+        async with app.extensions["async_engine"].begin() as connection:
+            await connection.run_sync(db.metadata.create_all)
+
+    loop.run_until_complete(create_tables())
+    yield app
+    loop.run_until_complete(app.extensions["async_engine"].dispose())
+
+
+@pytest.fixture
+def api(asgi_app, loop):
+    """Return a function making a request to asgi_app with the Quart test client, which
+    returns the status and JSON. Named api as pytest reserves request."""
+
+    def request(method, url, **kwargs):
+        async def send():
+            response = await getattr(asgi_app.test_client(), method)(url, **kwargs)
+            return response.status_code, await response.get_json()
+
+        return loop.run_until_complete(send())
+
+    return request
+
+
+@pytest.mark.parametrize(
+    "uri, expected",
+    [
+        ("sqlite:///:memory:", "sqlite+aiosqlite:///:memory:"),
+        ("postgresql://user@host/db", "postgresql+asyncpg://user@host/db"),
+        ("postgresql+psycopg2://user@host/db", "postgresql+asyncpg://user@host/db"),
+    ],
+)
+def test_async_database_uri(uri, expected):
+    """Test that synchronous database URIs are converted to asyncio drivers."""
+
+    assert async_database_uri(uri).render_as_string() == expected
+
+
+def test_create_and_filter_customers(api):
+    """Test creating an address and customers, then looking them up by region."""
+
+    status, address = api(
+        "post",
+        "/addresses",
+        json={"country_code": "au", "state_code": "vic", "street": "1 Test St",
+              "postcode": "3000"},
+    )  # fmt: skip
+    assert status == 201
+    assert address["country_code"] == "AU"
+
+    status, customer = api(
+        "post",
+        "/customers",
+        json={"f_name": "John", "email": "John@Email.com", "phone": "+61412345678",
+              "address_id": address["id"]},
+    )  # fmt: skip
+    assert status == 201
+    assert customer["email"] == "John@email.com"  # Normalized by the model validator
+    assert customer["address_id"] == address["id"]
+
+    status, customers = api("get", "/customers?country=AU&state=VIC")
+    assert status == 200
+    assert [c["email"] for c in customers] == ["John@email.com"]
+
+    status, counts = api("get", "/customers/counts?group_by=country")
+    assert counts == [{"country": "AU", "count": 1}]
+
+
+@pytest.mark.parametrize(
+    "changes, status, error",
+    [
+        ({"email": "duplicate@email.com"}, 409, "Email already exists"),
+        ({"address_id": 999}, 400, "Invalid Content"),  # Address does not exist
+        ({"address_id": None}, 400, "Invalid Content"),
+        ({"phone": "0412345678"}, 400, "Invalid Content"),  # Not E.164 formatted
+        ({"f_name": None}, 400, "Invalid format"),
+    ],
+)
+def test_create_customer_errors(api, changes, status, error):
+    """Test that the async customer route reports the same errors as the sync one."""
+
+    _, address = api(
+        "post",
+        "/addresses",
+        json={"country_code": "NZ", "state_code": "AUK", "street": "2 Test St",
+              "postcode": "1010"},
+    )  # fmt: skip
+    customer = {
+        "f_name": "Mary",
+        "email": "duplicate@email.com",
+        "address_id": address["id"],
+    }
+    api("post", "/customers", json=customer)  # Only succeeds in first run
+
+    customer = {**customer, "email": "unique@email.com", **changes}
+    response_status, body = api("post", "/customers", json=customer)
+    assert response_status == status
+    assert body["error"] == error
+
+
+def test_invalid_pagination(api):
+    """Test that the async customer list rejects invalid page parameters."""
+
+    status, body = api("get", "/customers?limit=0")
+    assert status == 400
+    assert body["error"] == "Invalid pagination"
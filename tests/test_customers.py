@@ -1,9 +1,14 @@
 """Test cases for Customer model, schema, and CRUD operations.
 Using TDD, we will implement the tests first and then the corresponding code."""
 
+from types import SimpleNamespace
 import pytest
+from psycopg2 import errorcodes
+from sqlalchemy import inspect
 from sqlalchemy.exc import IntegrityError
 from models import Customer, Address  # This will be created after failing the test
+from extensions import db
+from controllers.customers_controllers import integrity_error_response
 
 address = Address(  # Valid address instance for referential validation
     country_code="AU", state_code="NSW", street="test street", postcode="1234"
@@ -174,3 +179,168 @@ def test_customer_order_relationship(db_session):
     assert order.customer.email == "johnsmith@email.com"
     # Check that order can be accessed through customer
     assert customer.orders[0].order_id == 1
+
+
+def test_filter_customers_by_region(client, db_session):
+    """Test that GET /customers filters customers by the country, state and postcode
+    of their address, ignoring case of the ISO codes."""
+
+    nz_address = Address(
+        country_code="NZ", state_code="AUK", street="1 Queen St", postcode="1010"
+    )
+    other_nz_address = Address(
+        country_code="NZ", state_code="WGN", street="2 Lambton Quay", postcode="6011"
+    )
+    db_session.add_all([nz_address, other_nz_address])
+    db_session.commit()
+    db_session.add_all(
+        [
+            Customer(f_name="Aroha", email="aroha@email.com", address_id=nz_address.id),
+            Customer(
+                f_name="Tane", email="tane@email.com", address_id=other_nz_address.id
+            ),
+        ]
+    )
+    db_session.commit()
+
+    response = client.get("/customers?country=nz")
+    assert response.status_code == 200
+    assert {c["email"] for c in response.json} == {"aroha@email.com", "tane@email.com"}
+
+    response = client.get("/customers?country=NZ&state=WGN&postcode=6011")
+    assert [c["email"] for c in response.json] == ["tane@email.com"]
+
+
+def test_paginate_customers(client, db_session):
+    """Test that GET /customers returns bounded pages keyed on customer id, and that
+    without a region filter it includes customers whose address was deleted."""
+
+    deleted_address = Address(
+        country_code="FR", state_code="IDF", street="3 Rue Royale", postcode="75008"
+    )
+    db_session.add(deleted_address)
+    db_session.commit()
+    new_customers = [
+        Customer(f_name=name, email=f"{name}@page.com", address_id=deleted_address.id)
+        for name in ("first", "second", "third")
+    ]
+    db_session.add_all(new_customers)
+    db_session.commit()
+    first_id = new_customers[0].id
+
+    db_session.delete(deleted_address)  # ON DELETE SET NULL clears their address_id
+    db_session.commit()
+
+    response = client.get(f"/customers?after_id={first_id - 1}&limit=2")
+    assert response.status_code == 200
+    assert [c["email"] for c in response.json] == ["first@page.com", "second@page.com"]
+
+    last_id = response.json[-1]["id"]  # Next page starts after the last id returned
+    response = client.get(f"/customers?after_id={last_id}&limit=2")
+    assert [c["email"] for c in response.json] == ["third@page.com"]
+    assert response.json[0]["address_id"] is None
+
+    response = client.get(f"/customers?country=FR&after_id={first_id - 1}")
+    assert response.json == []  # Region filters only match customers with an address
+
+
+@pytest.mark.parametrize("query", ["limit=0", "limit=1001", "limit=ten", "after_id=x"])
+def test_invalid_pagination(client, query):
+    """Test that invalid page parameters are rejected."""
+
+    response = client.get(f"/customers?{query}")
+    assert response.status_code == 400
+    assert response.json["error"] == "Invalid pagination"
+
+
+def test_count_customers_by_region(client, db_session):
+    """Test that GET /customers/counts groups customer counts by region level."""
+
+    address_1 = Address(
+        country_code="CA", state_code="ON", street="1 Bay", postcode="M5J"
+    )
+    address_2 = Address(
+        country_code="CA", state_code="BC", street="2 Main", postcode="V6B"
+    )
+    db_session.add_all([address_1, address_2])
+    db_session.commit()
+    db_session.add_all(
+        [
+            Customer(f_name="Anne", email="anne@email.com", address_id=address_1.id),
+            Customer(f_name="Ben", email="ben@email.com", address_id=address_1.id),
+            Customer(f_name="Cate", email="cate@email.com", address_id=address_2.id),
+        ]
+    )
+    db_session.commit()
+
+    response = client.get("/customers/counts?country=CA")  # Grouped by state by default
+    assert response.status_code == 200
+    assert response.json == [
+        {"country": "CA", "state": "BC", "count": 1},
+        {"country": "CA", "state": "ON", "count": 2},
+    ]
+
+    response = client.get("/customers/counts?country=CA&group_by=country")
+    assert response.json == [{"country": "CA", "count": 3}]
+
+    response = client.get("/customers/counts?group_by=city")  # Invalid region level
+    assert response.status_code == 400
+
+
+def test_region_indexes(app):
+    """Test that the region lookup indexes are created on addresses and customers."""
+
+    with app.app_context():
+        inspector = inspect(db.engine)
+        address_indexes = {i["name"]: i for i in inspector.get_indexes("addresses")}
+        customer_indexes = {i["name"]: i for i in inspector.get_indexes("customers")}
+
+    assert address_indexes["ix_addresses_country_state_postcode"]["column_names"] == [
+        "country_code",
+        "state_code",
+        "postcode",
+    ]
+    assert customer_indexes["ix_customers_address_id"]["column_names"] == ["address_id"]
+
+
+
+class FakePGError(Exception):
+    """PostgreSQL driver error carrying the SQLSTATE and, like psycopg2, diagnostics."""
+
+    def __init__(self, message, pgcode, column_name=None):
+        super().__init__(message)
+        self.pgcode = pgcode
+        self.diag = SimpleNamespace(column_name=column_name)
+
+
+@pytest.mark.parametrize(
+    "orig, expected, status",
+    [
+        (
+            Exception("UNIQUE constraint failed: customers.email"),  # SQLite
+            {"error": "Email already exists"},
+            409,
+        ),
+        (
+            FakePGError("duplicate key", errorcodes.UNIQUE_VIOLATION),
+            {"error": "Email already exists"},
+            409,
+        ),
+        (
+            FakePGError("null value", errorcodes.NOT_NULL_VIOLATION, "email"),
+            {"error": "Required field missing", "field": "email"},
+            400,
+        ),
+        (
+            Exception("FOREIGN KEY constraint failed"),
+            {"error": "Database Integrity Error"},
+            400,
+        ),
+    ],
+)
+def test_integrity_error_response(orig, expected, status):
+    """Test the database error classification shared by the sync and async routes."""
+
+    body, code = integrity_error_response(IntegrityError("INSERT", {}, orig))
+    assert code == status
+    assert expected.items() <= body.items()
@@ -0,0 +1,160 @@
+"""Test cases for the sampling profiler enabled through the PROFILER_* config."""
+
+import os
+import threading
+import time
+import pytest
+from config import TestConfig
+from main import create_app
+
+
+@pytest.fixture
+def profiled_app(tmp_path):
+    """Return a function creating an app with the profiler enabled, writing to tmp_path,
+    and a slow route long enough to be sampled several times. Keyword arguments
+    override the PROFILER_* config. Profilers are stopped after the test so their
+    sampler threads do not outlive it."""
+
+    apps = []
+
+    def create(**config):
+        profiler_config = type(
+            "ProfilerConfig",
+            (TestConfig,),
+            {
+                "PROFILER_ENABLED": True,
+                "PROFILER_SAMPLE_RATE": 1.0,
+                "PROFILER_INTERVAL": 0.001,
+                "PROFILER_FLUSH_INTERVAL": 3600,  # Tests flush explicitly
+                "PROFILER_DIR": str(tmp_path),
+                **config,
+            },
+        )
+        app = create_app(profiler_config)
+
+        @app.route("/slow")
+        def slow_view():
+            time.sleep(0.05)
+            return "done"
+
+        apps.append(app)
+        return app
+
+    yield create
+    for app in apps:
+        app.extensions["profiler"].stop()
+
+
+def test_profiler_disabled_by_default():
+    """Test that the profiler is only attached when PROFILER_ENABLED is set."""
+
+    assert "profiler" not in create_app("config.TestConfig").extensions
+
+
+def test_profiler_writes_collapsed_stacks(tmp_path, profiled_app):
+    """Test that sampled stacks are written per endpoint in collapsed stack format."""
+
+    app = profiled_app()
+    app.test_client().get("/slow")
+    app.extensions["profiler"].flush()
+
+    files = list(tmp_path.glob("slow_view.*.folded"))
+    assert len(files) == 1
+    lines = files[0].read_text().splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert stack.split(";")[-1].endswith(":slow_view")  # Innermost frame last
+
+
+def test_profiler_skips_unsampled_requests(tmp_path, profiled_app):
+    """Test that no stacks are collected for requests outside the sample rate."""
+
+    app = profiled_app(PROFILER_SAMPLE_RATE=0.0)
+    app.test_client().get("/slow")
+    app.extensions["profiler"].flush()
+
+    assert not list(tmp_path.glob("*.folded"))
+
+
+def test_profiler_rotates_files(tmp_path, profiled_app):
+    """Test that collapsed stack files rotate once they reach PROFILER_MAX_BYTES."""
+
+    app = profiled_app(PROFILER_MAX_BYTES=200, PROFILER_BACKUP_COUNT=2)
+    client = app.test_client()
+    for _ in range(3):
+        client.get("/slow")
+        app.extensions["profiler"].flush()
+
+    assert len(list(tmp_path.glob("slow_view.*.folded*"))) == 3  # Current + 2 backups
+
+
+def test_profiler_parks_when_idle(profiled_app):
+    """Test that the sampler thread stops sampling once no request is marked."""
+
+    app = profiled_app()
+    profiler = app.extensions["profiler"]
+    samples = []
+    sample = profiler.sample
+    profiler.sample = lambda active: samples.append(active) or sample(active)
+
+    app.test_client().get("/slow")
+    time.sleep(0.02)  # Let the sampler finish its last interval
+    sampled = len(samples)
+    time.sleep(0.05)  # Many intervals with nothing marked
+
+    assert sampled > 0
+    assert len(samples) == sampled
+
+
+def test_profiler_stop(tmp_path, profiled_app):
+    """Test that stop ends the sampler thread and writes the remaining samples."""
+
+    app = profiled_app()
+    app.test_client().get("/slow")
+    profiler = app.extensions["profiler"]
+    thread = profiler.thread
+
+    profiler.stop()
+
+    assert not thread.is_alive()
+    assert "sampling-profiler" not in [t.name for t in threading.enumerate()]
+    assert list(tmp_path.glob("slow_view.*.folded"))
+
+
+def test_profiler_prunes_old_files(tmp_path, profiled_app):
+    """Test that files left by replaced workers are deleted, oldest first, once all
+    files together exceed PROFILER_MAX_TOTAL_BYTES."""
+
+    for age, pid in enumerate([101, 102, 103]):  # Files of workers that have exited
+        old_file = tmp_path / f"slow_view.{pid}.folded"
+        old_file.write_text("x" * 100)
+        os.utime(old_file, (1000 - age, 1000 - age))  # Worker 103 wrote the oldest
+
+    app = profiled_app()  # Default limit is far above what the test writes
+    app.test_client().get("/slow")
+    profiler = app.extensions["profiler"]
+    profiler.flush()
+    current = tmp_path / f"slow_view.{os.getpid()}.folded"
+    assert len(list(tmp_path.iterdir())) == 4  # Nothing pruned under the limit
+
+    profiler.max_total_bytes = current.stat().st_size + 150  # Room for 1 old file
+    profiler.prune()
+
+    remaining = {path.name for path in tmp_path.iterdir()}
+    assert remaining == {current.name, "slow_view.101.folded"}  # Newest old file kept
+
+def test_profiler_resets_after_fork(profiled_app):
+    """Test that a forked worker does not keep the samples and marked requests of the
+    parent process."""
+
+    profiler = profiled_app().extensions["profiler"]
+    profiler.stacks["slow_view"]["parent;stack"] += 1
+    profiler.active[12345] = "slow_view"  # Thread id only valid in the parent
+    profiler.pid = -1  # Pretend the profiler was started in another (parent) process
+
+    profiler.ensure_sampler()
+
+    assert not profiler.stacks
+    assert not profiler.active
@@ -0,0 +1,62 @@
+"""Test cases for the synthetic dataset generator and its CLI command."""
+
+import random
+import pytest
+from models import Address, Customer
+from synthetic_data import address_rows, customer_rows, insert_synthetic_data, REGIONS
+
+
+def test_rows_are_deterministic():
+    """Test that the same seed always generates the same rows."""
+
+    def generate(seed):
+        rng = random.Random(seed)
+        return list(address_rows(rng, 50)), list(customer_rows(rng, 50, range(1, 51)))
+
+    assert generate(7) == generate(7)
+    assert generate(7) != generate(8)
+
+
+def test_inserted_rows_are_valid(db_session):
+    """Test that bulk inserted rows already hold the values the model validators
+    would store, as bulk inserts bypass them."""
+
+    assert insert_synthetic_data(200, addresses=50, seed=1, batch_size=64) == {
+        "addresses": 50,
+        "customers": 200,
+    }
+
+    addresses = Address.query.all()
+    for address in addresses:
+        assert address.state_code in REGIONS[address.country_code]["states"]
+        assert address.validate_country_code("country_code", address.country_code) == (
+            address.country_code
+        )
+        assert len(address.postcode) <= 10
+
+    customers = Customer.query.all()
+    assert len({customer.email for customer in customers}) == len(customers)
+    for customer in customers:
+        assert customer.validate_email("email", customer.email) == customer.email
+        assert customer.validate_phone("phone", customer.phone) == customer.phone
+        assert db_session.get(Address, customer.address_id) is not None
+
+
+def test_customers_require_addresses(db_session):
+    """Test that customers cannot be generated without addresses to link to."""
+
+    with pytest.raises(ValueError):
+        insert_synthetic_data(10, addresses=0)
+
+
+def test_seed_synthetic_command(app, db_session):
+    """Test that the CLI command appends rows after those already in the database."""
+
+    before = Customer.query.count()
+    result = app.test_cli_runner().invoke(
+        args=["db", "seed-synthetic", "--customers", "20", "--seed", "3"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Inserted 20 addresses and 20 customers" in result.output
+    assert Customer.query.count() == before + 20